@@ -1,14 +1,23 @@
 import os
-import json
+import asyncio
+import functools
+import hashlib
+import itertools
+import random
+import re
+import stat
+import threading
 import time
 import logging
-import signal
-import sys
-from typing import Dict, List, Any, Optional, Union
+import anyio
+import orjson
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Annotated, AsyncIterator, Awaitable, Callable, Deque, Dict, Hashable, List, Literal, Any, Optional, Tuple, Union
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse, PlainTextResponse
-from pydantic import BaseModel, ValidationError, Field, validator
-from prometheus_client import CollectorRegistry, Gauge, Counter, Info, generate_latest, CONTENT_TYPE_LATEST
+from fastapi.responses import ORJSONResponse, PlainTextResponse, Response
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, TypeAdapter, validator
 
 logging.basicConfig(
     level=logging.INFO,
@@ -16,25 +25,38 @@ logging.basicConfig(
 )
 log = logging.getLogger("robot-fleet")
 
-app = FastAPI(title="Robot Fleet Management", version="1.0.0")
+# Most recent error messages kept in memory; error_count keeps the running total
+MAX_ERROR_HISTORY = 1024
 
 # Global state
-STATE = {
-    "robot_id": None, 
-    "sensors": [], 
-    "initialized": False,
-    "startup_time": None,
-    "config_version": None,
-    "health_checks": 0,
-    "asset_validation_retries": 0,
-    "errors": []
-}
+@dataclass(slots=True)
+class RobotState:
+    robot_id: Optional[str] = None
+    sensors: List["Sensor"] = field(default_factory=list)
+    initialized: bool = False
+    startup_time: Optional[float] = None
+    startup_mono_ns: Optional[int] = None
+    config_version: Optional[str] = None
+    health_checks: int = 0
+    asset_validation_retries: int = 0
+    errors: Deque[str] = field(default_factory=lambda: deque(maxlen=MAX_ERROR_HISTORY))
+    error_count: int = 0
+    sensor_info_cache: Tuple[str, ...] = ()
+
+STATE = RobotState()
+
+# wgs84_coordinates is validated before secrets are resolved, as the coordinates or a SECRET:
+# reference to them. Resolving writes whatever JSON the secret holds onto the model, so the
+# stored field is Any and only the config input is checked against that shape
+Wgs84Coordinates = Annotated[Any, AfterValidator(TypeAdapter(Union[Dict[str, float], str]).validate_python)]
 
-# Sensor models with validation
+# Sensor models with validation; keys outside the schema are kept and echoed by /status and /init
 class SensorA(BaseModel):
-    type: str = "sensor_a"
+    model_config = ConfigDict(extra="allow")
+    
+    type: Literal["sensor_a"] = "sensor_a"
     range: float
-    wgs84_coordinates: Dict[str, float]
+    wgs84_coordinates: Wgs84Coordinates
     bit_mask: str
     
     @validator('range')
@@ -44,8 +66,10 @@ class SensorA(BaseModel):
         return v
 
 class SensorB(BaseModel):
-    type: str = "sensor_b"
-    wgs84_coordinates: Dict[str, float]
+    model_config = ConfigDict(extra="allow")
+    
+    type: Literal["sensor_b"] = "sensor_b"
+    wgs84_coordinates: Wgs84Coordinates
     speed_km_per_h: float
     
     @validator('speed_km_per_h')
@@ -55,7 +79,9 @@ class SensorB(BaseModel):
         return v
 
 class SensorC(BaseModel):
-    type: str = "sensor_c"
+    model_config = ConfigDict(extra="allow")
+    
+    type: Literal["sensor_c"] = "sensor_c"
     field_map: str
     battery_pct: float
     
@@ -65,34 +91,85 @@ class SensorC(BaseModel):
             raise ValueError('battery_pct must be between 0 and 100')
         return v
 
+Sensor = Annotated[Union[SensorA, SensorB, SensorC], Field(discriminator="type")]
+
 class RobotConfig(BaseModel):
     robot_id: str
-    sensors: List[Dict[str, Any]]
+    sensors: List[Sensor] = Field(min_length=1, description="At least one sensor is required")
     version: Optional[str] = Field(default="1.0.0", description="Configuration version")
 
+# Upper bound for a single retry backoff, in seconds
+BACKOFF_CAP_SECONDS = 60
+
+def next_backoff(attempt: int, base: float = 5, cap: float = BACKOFF_CAP_SECONDS) -> float:
+    """Exponential backoff with full jitter, capped so restarts across the fleet don't retry in lockstep"""
+    return random.uniform(0, min(cap, base * (1 << attempt)))
+
 def validate_asset_file(file_path: str, asset_type: str) -> bool:
     """Validate that asset files exist and are readable"""
     try:
-        if not os.path.exists(file_path) or not os.path.isfile(file_path) or not os.access(file_path, os.R_OK):
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            # missing, unreadable parent or a dangling path component: all the same to the caller
+            log.error("Asset file not found or not readable.")
+            return False
+        # One stat covers exists/isfile/getsize; only readability needs a second syscall
+        if not stat.S_ISREG(st.st_mode) or not os.access(file_path, os.R_OK):
             log.error("Asset file not found or not readable.")
             return False
-        file_size = os.path.getsize(file_path)
-        if file_size == 0:
+        if st.st_size == 0:
             log.warning(f"Asset file is empty: {file_path} for {asset_type}")
         return True
     except Exception as e:
         log.error(f"Error validating asset file {file_path} for {asset_type}: {e}")
         return False
 
-def read_secret(robot_id: str, sensor_name: str, secret_key: str = "wgs84_coordinates", retry_count: int = 2, retry_delay: int = 5) -> Union[Dict, str]:
+async def shared_once(cache: Dict[Hashable, "asyncio.Future[Any]"], key: Hashable,
+                      factory: Callable[[], Awaitable[Any]]) -> Any:
+    """Await factory() once per key: concurrent callers share the in-flight call and later
+    callers get the stored result. Failures are evicted so the next call tries again."""
+    future = cache.get(key)
+    if future is None:
+        future = cache[key] = asyncio.ensure_future(factory())
+        
+        def evict_on_failure(done: "asyncio.Future[Any]") -> None:
+            if done.cancelled() or done.exception() is not None:
+                cache.pop(key, None)
+        future.add_done_callback(evict_on_failure)
+    # shield so one cancelled awaiter doesn't cancel the read for everyone else
+    return await asyncio.shield(future)
+
+# Parsed secrets files and in-flight asset validations, shared during startup only
+_SECRET_FILES: Dict[Hashable, "asyncio.Future[Any]"] = {}
+_ASSET_VALIDATIONS: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+def clear_startup_caches() -> None:
+    """Drop startup-only caches; the secrets file contents shouldn't outlive initialization"""
+    for cache in (_SECRET_FILES, _ASSET_VALIDATIONS):
+        # Only a failed startup leaves calls in flight; nobody is left to await them
+        for future in cache.values():
+            future.cancel()
+        cache.clear()
+
+async def _read_secret_file(secret_path: str) -> Dict[str, Any]:
+    if not await anyio.Path(secret_path).exists():
+        raise FileNotFoundError(secret_path)
+    async with await anyio.open_file(secret_path, 'rb') as f:
+        return orjson.loads(await f.read())
+
+async def read_secret(robot_id: str, sensor_name: str, secret_key: str = "wgs84_coordinates", retry_count: int = 2, retry_delay: int = 5) -> Union[Dict, str]:
     """Read secret with exponential backoff retry logic"""
     for attempt in range(retry_count):
         try:
             secret_path = f"/run/secrets/{robot_id}"
-            if os.path.exists(secret_path):
-                with open(secret_path, 'r') as f:
-                    secret_data = json.load(f)
-
+            try:
+                # Every sensor of a robot reads the same file; parse it once
+                secret_data = await shared_once(_SECRET_FILES, secret_path, lambda: _read_secret_file(secret_path))
+            except FileNotFoundError:
+                secret_data = None
+            
+            if secret_data is not None:
                 if sensor_name in secret_data and secret_key in secret_data[sensor_name]:
                     return secret_data[sensor_name][secret_key]
                 else:
@@ -103,272 +180,447 @@ def read_secret(robot_id: str, sensor_name: str, secret_key: str = "wgs84_coordi
             env_value = os.getenv(env_key)
             if env_value:
                 try:
-                    return json.loads(env_value)
-                except json.JSONDecodeError:
+                    return orjson.loads(env_value)
+                except orjson.JSONDecodeError:
                     return env_value
             
             if attempt < retry_count - 1:
                 backoff_delay = retry_delay * (2 ** attempt)  # exponential backoff
                 log.warning(f"Secret {secret_key} for {sensor_name} in {robot_id} not found, "
                            f"retrying in {backoff_delay}s (attempt {attempt+1}/{retry_count})")
-                time.sleep(backoff_delay)
+                await asyncio.sleep(backoff_delay)
         except Exception as e:
+            # The parsed file may be the stale one missing this key; the retry must read the disk again
+            _SECRET_FILES.pop(secret_path, None)
             if attempt < retry_count - 1:
                 backoff_delay = retry_delay * (2 ** attempt)
                 log.warning(f"Error reading secret {secret_key} for {sensor_name} in {robot_id}: {e}, "
                            f"retrying in {backoff_delay}s (attempt {attempt+1}/{retry_count})")
-                time.sleep(backoff_delay)
+                await asyncio.sleep(backoff_delay)
 
     raise RuntimeError(f"Failed to read secret {secret_key} for {sensor_name} in {robot_id} after {retry_count} attempts")
 
-def resolve_secrets_in_config(config: Dict[str, Any]) -> Dict[str, Any]:
-    robot_id = config.get("robot_id", "unknown")
-    
-    def resolve_value(value, context_sensor_name=None):
-        if isinstance(value, str) and value.startswith("SECRET:"):
-            # Parse SECRET:robot_id:sensor_name:secret_key format
-            parts = value.split(":", 3)
-            if len(parts) >= 3:
-                secret_robot_id = parts[1]
-                secret_sensor_name = parts[2]
-                secret_key = parts[3] if len(parts) > 3 else "wgs84_coordinates"
-                return read_secret(secret_robot_id, secret_sensor_name, secret_key)
-            else:
-                raise ValueError(f"Invalid secret format: {value}. Expected SECRET:robot_id:sensor_name:secret_key")
-        return value
-    
-    def parse_dict(obj, sensor_name=None):
-        if isinstance(obj, dict):
-            return {k: parse_dict(resolve_value(v, sensor_name), sensor_name) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [parse_dict(item, sensor_name) for item in obj]
+# SECRET:robot_id:sensor_name[:secret_key], secret_key defaulting to wgs84_coordinates.
+# Used with fullmatch, and no part may span a newline, so a stray "\n" is an invalid reference
+_SECRET_RE = re.compile(r"SECRET:([^:\n]+):([^:\n]+)(?::([^\n]+))?")
+
+def parse_secret_reference(value: str) -> Tuple[str, str, str]:
+    """Parse SECRET:robot_id:sensor_name:secret_key format into its (robot_id, sensor_name, secret_key)"""
+    match = _SECRET_RE.fullmatch(value)
+    if match is None:
+        raise ValueError(f"Invalid secret format: {value}. Expected SECRET:robot_id:sensor_name:secret_key")
+    robot_id, sensor_name, secret_key = match.groups()
+    return robot_id, sensor_name, secret_key or "wgs84_coordinates"
+
+def find_secret_references(root: Any) -> List[Tuple[Any, Any, Tuple[str, str, str]]]:
+    """Every (container, key, reference) under root; containers are dicts, lists or sensor models"""
+    # Explicit stack; scalars other than str are skipped outright
+    locations: List[Tuple[Any, Any, Tuple[str, str, str]]] = []
+    stack: List[Any] = [root]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, BaseModel):
+            items = iter(node)  # fields followed by any extra keys
+        elif isinstance(node, dict):
+            items = node.items()
         else:
-            return resolve_value(obj, sensor_name)
-    
-    if "sensors" in config:
-        resolved_sensors = []
-        for sensor in config["sensors"]:
-            sensor_name = sensor.get("type", "unknown")
-            resolved_sensor = parse_dict(sensor, sensor_name)
-            resolved_sensors.append(resolved_sensor)
-        config["sensors"] = resolved_sensors
-    
-    return config
+            items = enumerate(node)
+        for k, v in items:
+            if isinstance(v, str):
+                if v.startswith("SECRET:"):
+                    locations.append((node, k, parse_secret_reference(v)))
+            elif isinstance(v, (dict, list, BaseModel)):
+                stack.append(v)
+    return locations
 
-def validate_sensor_config(sensor: Dict[str, Any], retry_count: int = 3, retry_delay: int = 5) -> None:
-    """Validate individual sensor config and assets with retry logic"""
-    sensor_type = sensor.get("type")
-    
-    if sensor_type == "sensor_a":
-        if "bit_mask" not in sensor:
-            raise ValueError("sensor_a requires bit_mask field")
-        
-        bit_mask_path = sensor["bit_mask"]
-        
-        for attempt in range(retry_count):
-            if validate_asset_file(bit_mask_path, "sensor_a bit_mask"):
-                break
-            if attempt < retry_count - 1:
-                STATE["asset_validation_retries"] += 1
-                backoff_delay = retry_delay * (2 ** attempt)
-                log.warning(f"Asset validation failed for {bit_mask_path}, "
-                           f"retrying in {backoff_delay}s (attempt {attempt+1}/{retry_count})")
-                time.sleep(backoff_delay)
-            else:
-                raise ValueError(f"Asset file validation failed for sensor_a bit_mask: {bit_mask_path}")
-    
-    elif sensor_type == "sensor_b":
-        if "speed_km_per_h" not in sensor:
-            raise ValueError("sensor_b requires speed_km_per_h field")
-    
-    elif sensor_type == "sensor_c":
-        if "field_map" not in sensor:
-            raise ValueError("sensor_c requires field_map field")
-        
-        field_map_path = sensor["field_map"]
-        
-        for attempt in range(retry_count):
-            if validate_asset_file(field_map_path, "sensor_c field_map"):
-                break
-            if attempt < retry_count - 1:
-                STATE["asset_validation_retries"] += 1
-                backoff_delay = retry_delay * (2 ** attempt)
-                log.warning(f"Asset validation failed for {field_map_path}, "
-                           f"retrying in {backoff_delay}s (attempt {attempt+1}/{retry_count})")
-                time.sleep(backoff_delay)
-            else:
-                raise ValueError(f"Asset file validation failed for sensor_c field_map: {field_map_path}")
+async def read_sensor_secrets(config: Dict[str, Any]) -> Dict[Tuple[str, str, str], Any]:
+    """Read every distinct secret referenced by the config's sensors concurrently"""
+    # Sensors referencing the same robot_id/sensor/key share a single read
+    unique_refs = list(dict.fromkeys(ref for _, _, ref in find_secret_references(config["sensors"])))
+    values = await asyncio.gather(*[read_secret(*ref) for ref in unique_refs])
+    return dict(zip(unique_refs, values))
 
-def validate_robot_config(config: Dict[str, Any]) -> None:
-    if "robot_id" not in config:
-        raise ValueError("robot_id is required")
-    
-    sensors = config.get("sensors", [])
-    if not sensors:
-        raise ValueError("At least one sensor is required")
+def resolve_secrets_in_sensors(sensors: List[Sensor], secrets: Dict[Tuple[str, str, str], Any]) -> None:
+    """Replace the SECRET: references held by the validated sensors with their secret values"""
+    for node, k, ref in find_secret_references(sensors):
+        if isinstance(node, BaseModel):
+            setattr(node, k, secrets[ref])
+        else:
+            node[k] = secrets[ref]
+
+async def validate_asset_with_retry(file_path: str, asset_type: str, retry_count: int, retry_delay: int) -> None:
+    """Validate an asset file once even when several sensors reference it concurrently"""
+    await shared_once(_ASSET_VALIDATIONS, (file_path, asset_type),
+                      lambda: _validate_asset_attempts(file_path, asset_type, retry_count, retry_delay))
+
+async def _validate_asset_attempts(file_path: str, asset_type: str, retry_count: int, retry_delay: int) -> None:
+    """Validate an asset file, backing off between failed attempts and raising after the last one"""
+    for attempt in range(retry_count):
+        if await asyncio.to_thread(validate_asset_file, file_path, asset_type):
+            return
+        if attempt == retry_count - 1:
+            raise ValueError(f"Asset file validation failed for {asset_type}: {file_path}")
+        STATE.asset_validation_retries += 1
+        backoff_delay = next_backoff(attempt, retry_delay)
+        log.warning(f"Asset validation failed for {file_path}, "
+                   f"retrying in {backoff_delay:.1f}s (attempt {attempt+1}/{retry_count})")
+        await asyncio.sleep(backoff_delay)
+
+# Asset file field each sensor type references; types without one have nothing to check on disk
+ASSET_FIELDS = {"sensor_a": "bit_mask", "sensor_c": "field_map"}
+
+async def validate_sensor_config(sensor: Sensor, retry_count: int = 3, retry_delay: int = 5) -> None:
+    """Validate the asset files referenced by a sensor with retry logic"""
+    asset_field = ASSET_FIELDS.get(sensor.type)
+    if asset_field is None:
+        return
     
-    valid_sensor_types = {"sensor_a", "sensor_b", "sensor_c"}
+    file_path = getattr(sensor, asset_field)
+    await validate_asset_with_retry(file_path, f"{sensor.type} {asset_field}", retry_count, retry_delay)
+
+def raw_asset_paths(config: Dict[str, Any]) -> List[str]:
+    """Asset paths from a config that may not be valid (the validation marker is checked before
+    the schema), skipping anything malformed"""
+    if not isinstance(config, dict):
+        return []
+    sensors = config.get("sensors")
+    if not isinstance(sensors, list):
+        return []
     
+    paths = []
     for sensor in sensors:
-        sensor_type = sensor.get("type")
-        if not sensor_type:
-            raise ValueError("Sensor missing required 'type' field")
-            
-        if sensor_type not in valid_sensor_types:
-            raise ValueError(f"Invalid sensor type: {sensor_type}")
-        
-        validate_sensor_config(sensor)
+        sensor_type = sensor.get("type") if isinstance(sensor, dict) else None
+        asset_field = ASSET_FIELDS.get(sensor_type) if isinstance(sensor_type, str) else None
+        if asset_field and isinstance(sensor.get(asset_field), str):
+            paths.append(sensor[asset_field])
+    return paths
 
-def format_sensor_info(sensor: Dict[str, Any]) -> str:
-    """Format sensor info for clean and consistent logging"""
-    sensor_type = sensor["type"]
-    
-    if sensor_type == "sensor_a":
-        range_val = sensor.get("range", "N/A")
-        bit_mask_path = sensor.get("bit_mask", "N/A")
-        return f"sensor_a (range={range_val}, bit_mask={bit_mask_path})"
-    
-    elif sensor_type == "sensor_b":
-        speed = sensor.get("speed_km_per_h", "N/A")
-        return f"sensor_b (speed={speed} km/h)"
+async def validate_robot_config(config: Dict[str, Any]) -> RobotConfig:
+    """Validate config schema via the pydantic models, then the referenced asset files"""
+    robot_config = RobotConfig.model_validate(config)
     
-    elif sensor_type == "sensor_c":
-        battery = sensor.get("battery_pct", "N/A")
-        field_map_path = sensor.get("field_map", "N/A")
-        return f"sensor_c (field_map={field_map_path}, battery={battery}%)"
+    # Sensors are independent, so their asset checks (and retry backoffs) overlap
+    await asyncio.gather(*[validate_sensor_config(sensor) for sensor in robot_config.sensors])
+    return robot_config
+
+# Written by app.validate_config before uvicorn starts, so workers can skip asset validation
+VALIDATED_CONFIG_PATH = os.getenv("ROBOT_VALIDATED_CONFIG", "/tmp/robot-config.validated.json")
+
+async def load_config_bytes(config_path: str) -> Tuple[bytes, str]:
+    """Read the raw config file and its sha256 checksum"""
+    async with await anyio.open_file(config_path, 'rb') as f:
+        raw = await f.read()
+    return raw, hashlib.sha256(raw).hexdigest()
+
+def asset_fingerprint(file_paths: List[str]) -> List[List[Any]]:
+    """Stat identity of each referenced asset, so a marker goes stale once an asset changes or disappears"""
+    fingerprint = []
+    for file_path in sorted(set(file_paths)):
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            fingerprint.append([file_path, None])
+            continue
+        # ctime also moves on chmod/chown, which can make an unchanged file unreadable
+        fingerprint.append([file_path, st.st_mtime_ns, st.st_ctime_ns, st.st_size])
+    return fingerprint
+
+def write_validation_marker(config: Dict[str, Any], checksum: str) -> None:
+    """Record that the config with this checksum passed validation against the assets as they are now.
     
-    return f"{sensor_type} (unknown configuration)"
+    Only the marker is written, never the config itself: workers always build their config from
+    the config file they just read.
+    """
+    payload = {
+        "checksum": checksum,
+        "assets": asset_fingerprint(raw_asset_paths(config)),
+        "asset_validation_retries": STATE.asset_validation_retries
+    }
+    tmp_path = f"{VALIDATED_CONFIG_PATH}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(payload))
+    os.replace(tmp_path, VALIDATED_CONFIG_PATH)
+
+async def load_validation_marker(config: Dict[str, Any], checksum: str) -> Optional[Dict[str, Any]]:
+    """Return the validation marker if it matches both the current config file and its assets on disk"""
+    try:
+        async with await anyio.open_file(VALIDATED_CONFIG_PATH, 'rb') as f:
+            payload = orjson.loads(await f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+    if not isinstance(payload, dict) or payload.get("checksum") != checksum:
+        log.warning("Validation marker does not match the current config file, ignoring it")
+        return None
+    if payload.get("assets") != await asyncio.to_thread(asset_fingerprint, raw_asset_paths(config)):
+        log.warning("Assets changed since the config was validated, ignoring the validation marker")
+        return None
+    return payload
+
+def _fmt_a(sensor: SensorA) -> str:
+    return f"sensor_a (range={sensor.range}, bit_mask={sensor.bit_mask})"
+
+def _fmt_b(sensor: SensorB) -> str:
+    return f"sensor_b (speed={sensor.speed_km_per_h} km/h)"
+
+def _fmt_c(sensor: SensorC) -> str:
+    return f"sensor_c (field_map={sensor.field_map}, battery={sensor.battery_pct}%)"
+
+# One entry per Sensor type; the discriminated union rejects every other type at validation
+FORMATTERS = {"sensor_a": _fmt_a, "sensor_b": _fmt_b, "sensor_c": _fmt_c}
 
-@app.on_event("startup")
-async def startup_event():
+def format_sensor_info(sensor: Sensor) -> str:
+    """Format sensor info for clean and consistent logging"""
+    return FORMATTERS[sensor.type](sensor)
+
+def _uptime() -> Optional[int]:
+    """Whole seconds since startup, from the monotonic clock so wall-clock jumps don't skew it"""
+    if STATE.startup_mono_ns is None:
+        return None
+    return (time.monotonic_ns() - STATE.startup_mono_ns) // 1_000_000_000
+
+# Response payloads that only change at startup, filled in by startup_event
+_HEALTH_BASE: Dict[str, Any] = {}
+_STATUS_BASE: Dict[str, Any] = {}
+_INIT_RESPONSE: Dict[str, Any] = {}
+_METRICS_BASE: Dict[str, Any] = {
+    "initialized": False,
+    "sensors_count": 0,
+    "robot_id": None
+}
+_ROOT_RESPONSE: Dict[str, Any] = {
+    "message": "Robot Fleet Management System",
+    "robot_id": None,
+    "status": "initializing",
+    "config_version": None
+}
+
+def precompute_responses() -> None:
+    """Build the immutable parts of the endpoint responses once the robot is initialized"""
+    # Dump the sensor models once here rather than having every response re-encode them
+    sensor_payload = [sensor.model_dump() for sensor in STATE.sensors]
+    _HEALTH_BASE.update({
+        "status": "healthy",
+        "robot_id": STATE.robot_id,
+        "sensors_count": len(STATE.sensors),
+        "config_version": STATE.config_version
+    })
+    _STATUS_BASE.update({
+        "robot_id": STATE.robot_id,
+        "sensors": sensor_payload,
+        "initialized": STATE.initialized,
+        "config_version": STATE.config_version
+    })
+    _INIT_RESPONSE.update({
+        "robot_id": STATE.robot_id,
+        "initialization_message": f"Robot {STATE.robot_id} initialized with sensors: {', '.join(STATE.sensor_info_cache)}",
+        "config_version": STATE.config_version,
+        "initialized_at": STATE.startup_time,
+        "sensors_configured": len(STATE.sensors),
+        "sensor_summary": STATE.sensor_info_cache,
+        "full_resolved_config": {
+            "robot_id": STATE.robot_id,
+            "version": STATE.config_version, 
+            "sensors": sensor_payload
+        },
+    })
+    _METRICS_BASE.update({
+        "initialized": STATE.initialized,
+        "sensors_count": len(STATE.sensors),
+        "robot_id": STATE.robot_id
+    })
+    _ROOT_RESPONSE.update({
+        "robot_id": STATE.robot_id,
+        "status": "running",
+        "config_version": STATE.config_version
+    })
+
+async def startup_event() -> None:
     """Initialize robot on startup"""
     try:
-        STATE["startup_time"] = time.time()
+        STATE.startup_time = time.time()
+        STATE.startup_mono_ns = time.monotonic_ns()
         config_path = os.getenv("ROBOT_CONFIG", "/app/config.json") # where config is mounted 
         log.info(f"Loading configuration from: {config_path}")
         
-        with open(config_path, 'r') as f:
-            raw_config = json.load(f)
-        
-        validate_robot_config(raw_config)
+        raw_bytes, checksum = await load_config_bytes(config_path)
+        raw_config = orjson.loads(raw_bytes)
+        marker = await load_validation_marker(raw_config, checksum)
+        if marker is not None:
+            # Assets were checked by app.validate_config; the schema is cheap enough to redo
+            log.info(f"Configuration already validated, see: {VALIDATED_CONFIG_PATH}")
+            STATE.asset_validation_retries += marker["asset_validation_retries"]
+            robot_config = RobotConfig.model_validate(raw_config)
+            secrets = await read_sensor_secrets(raw_config)
+        else:
+            # Not started through app.validate_config (e.g. local dev), validate in-process.
+            # The asset checks run in the thread pool while the secrets referenced by the raw
+            # config are read. A failure on either side cancels the other, and the schema check
+            # fails before the first secret is read.
+            try:
+                async with asyncio.TaskGroup() as tg:
+                    validating = tg.create_task(validate_robot_config(raw_config))
+                    reading = tg.create_task(read_sensor_secrets(raw_config))
+            except ExceptionGroup as eg:
+                raise eg.exceptions[0] from None
+            robot_config, secrets = validating.result(), reading.result()
         
-        config = resolve_secrets_in_config(raw_config)
+        resolve_secrets_in_sensors(robot_config.sensors, secrets)
         
         # Store config version if there is one 
-        if "version" in config:
-            STATE["config_version"] = config["version"]
+        if "version" in raw_config:
+            STATE.config_version = robot_config.version
         
-        STATE["robot_id"] = config["robot_id"]
-        STATE["sensors"] = config["sensors"]
-        STATE["initialized"] = True
+        STATE.robot_id = robot_config.robot_id
+        STATE.sensors = robot_config.sensors
+        STATE.initialized = True
         
-        sensor_info = [format_sensor_info(sensor) for sensor in config["sensors"]]
-        log.info(f"Robot {config['robot_id']} initialized with sensors: {', '.join(sensor_info)}")
-        
-        # Signal handlers for graceful shutdown
-        for sig in (signal.SIGTERM, signal.SIGINT):
-            signal.signal(sig, handle_shutdown)
-            
-        log.info(f"Robot {config['robot_id']} ready and running")
+        # Sensors don't change after startup, so each one is formatted exactly once
+        STATE.sensor_info_cache = tuple(format_sensor_info(sensor) for sensor in STATE.sensors)
+        precompute_responses()
+        clear_startup_caches()
+        log.info(_INIT_RESPONSE["initialization_message"])
+        log.info(f"Robot {STATE.robot_id} ready and running")
         
     except Exception as e:
-        STATE["errors"].append(str(e))
+        clear_startup_caches()
+        STATE.errors.append(str(e))
+        STATE.error_count += 1
         log.error(f"Failed to initialize robot: {e}")
         raise
 
-def handle_shutdown(sig, frame):
-    log.info(f"Received shutdown signal {sig}, performing graceful shutdown...")
-    log.info(f"Robot {STATE.get('robot_id', 'unknown')} shutting down")
-    sys.exit(0)
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Run startup before serving; uvicorn's own SIGTERM/SIGINT handling drives the shutdown half"""
+    await startup_event()
+    yield
+    log.info(f"Robot {STATE.robot_id} shutting down")
+
+app = FastAPI(title="Robot Fleet Management", version="1.0.0", default_response_class=ORJSONResponse, lifespan=lifespan)
+
+# Serialized body of the last 500, reused while the same error keeps repeating (error storms)
+_ERROR_BODY_CACHE = {"message": None, "bytes": b""}
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     error_msg = str(exc)
-    STATE["errors"].append(error_msg)
+    STATE.errors.append(error_msg)
+    STATE.error_count += 1
     log.error(f"Unhandled exception: {error_msg}")
-    return JSONResponse(
-        status_code=500,
-        content={"detail": error_msg}
-    )
+    if error_msg != _ERROR_BODY_CACHE["message"]:
+        _ERROR_BODY_CACHE["bytes"] = orjson.dumps({"detail": error_msg})
+        _ERROR_BODY_CACHE["message"] = error_msg
+    return Response(_ERROR_BODY_CACHE["bytes"], status_code=500, media_type="application/json")
+
+_health_counter = itertools.count(1)
+
+# Serialized /health body, rebuilt at most once per second since uptime is reported in whole seconds
+HEALTH_CACHE_TTL_NS = 1_000_000_000
+_HEALTH_CACHE = {"bytes": b"", "expires_mono_ns": 0}
 
-@app.get("/health")
+@app.get("/health", response_model=None)
 async def health_check():
     """Health check endpoint for monitoring and Docker health checks"""
-    STATE["health_checks"] += 1
+    # next() on itertools.count is a single C-level increment, safe even under threaded handlers
+    STATE.health_checks = next(_health_counter)
     
-    if not STATE["initialized"]:
+    if not STATE.initialized:
         raise HTTPException(status_code=503, detail="Robot not initialized")
     
-    return {
-        "status": "healthy",
-        "robot_id": STATE["robot_id"],
-        "sensors_count": len(STATE["sensors"]),
-        "uptime_seconds": int(time.time() - STATE["startup_time"]) if STATE["startup_time"] else None,
-        "config_version": STATE["config_version"]
-    }
+    now = time.monotonic_ns()
+    if now >= _HEALTH_CACHE["expires_mono_ns"]:
+        _HEALTH_CACHE["bytes"] = orjson.dumps({**_HEALTH_BASE, "uptime_seconds": _uptime()})
+        _HEALTH_CACHE["expires_mono_ns"] = now + HEALTH_CACHE_TTL_NS
+    return Response(_HEALTH_CACHE["bytes"], media_type="application/json")
 
-@app.get("/status")
+@app.get("/status", response_model=None)
 async def status():
     """Detailed status endpoint"""
-    if not STATE["initialized"]:
+    if not STATE.initialized:
         raise HTTPException(status_code=503, detail="Robot not initialized")
     
-    return {
-        "robot_id": STATE["robot_id"],
-        "sensors": STATE["sensors"],
-        "initialized": STATE["initialized"],
-        "uptime_seconds": int(time.time() - STATE["startup_time"]) if STATE["startup_time"] else None,
-        "config_version": STATE["config_version"]
-    }
+    return {**_STATUS_BASE, "uptime_seconds": _uptime()}
 
-@app.get("/metrics")
+@app.get("/metrics", response_model=None)
 async def metrics():
     metrics_data = {
-        "health_checks": STATE["health_checks"],
-        "asset_validation_retries": STATE["asset_validation_retries"],
-        "uptime_seconds": int(time.time() - STATE["startup_time"]) if STATE["startup_time"] else None,
-        "error_count": len(STATE["errors"]),
-        "initialized": STATE["initialized"],
-        "sensors_count": len(STATE["sensors"]) if STATE["sensors"] else 0,
-        "robot_id": STATE["robot_id"],
+        **_METRICS_BASE,
+        "health_checks": STATE.health_checks,
+        "asset_validation_retries": STATE.asset_validation_retries,
+        "uptime_seconds": _uptime(),
+        "error_count": STATE.error_count,
         "timestamp": time.time()
     }
     
-    log.info(f"METRICS: {json.dumps(metrics_data)}")
+    # Encoding the payload just for a log line costs as much as the response; opt in via DEBUG
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug(f"METRICS: {orjson.dumps(metrics_data).decode()}")
     
     return metrics_data
 
-# Prometheus metrics setup according to https://prometheus.io/docs/instrumenting/writing_clientlibs/#metrics
-registry = CollectorRegistry()
+# Counter totals already pushed to Prometheus, so each scrape only inc()s the difference
+_PROM_REPORTED = {"health_checks": 0, "errors": 0, "retries": 0}
+# Scrapes run in the threadpool; two overlapping ones must not both report the same delta
+_PROM_LOCK = threading.Lock()
 
-robot_uptime = Gauge('robot_uptime_seconds', 'Total uptime of the robot in seconds', 
-                    ['robot_id'], registry=registry)
-robot_sensors = Gauge('robot_sensors_total', 'Total number of sensors configured', 
-                     ['robot_id'], registry=registry)
-robot_health_checks = Counter('robot_health_checks_total', 'Total number of health checks performed', 
-                             ['robot_id'], registry=registry)
-robot_errors = Counter('robot_errors_total', 'Total number of errors encountered', 
-                      ['robot_id'], registry=registry)
-robot_retries = Counter('robot_asset_validation_retries_total', 'Total number of asset validation retries', 
-                       ['robot_id'], registry=registry)
-robot_initialized = Gauge('robot_initialized', 'Robot initialization status (1 = initialized, 0 = not initialized)', 
+@functools.lru_cache(maxsize=None)
+def _get_prom_registry() -> Tuple[Any, Dict[str, Any]]:
+    """Build the registry and this robot's labelled children on the first scrape.
+    
+    prometheus_client is only needed by /prometheus, so importing it here keeps it off the
+    startup path. Scrapes are only served once startup has set STATE.robot_id.
+    """
+    from prometheus_client import CollectorRegistry, Counter, Gauge
+    
+    # Prometheus metrics setup according to https://prometheus.io/docs/instrumenting/writing_clientlibs/#metrics
+    registry = CollectorRegistry()
+    
+    robot_uptime = Gauge('robot_uptime_seconds', 'Total uptime of the robot in seconds', 
+                        ['robot_id'], registry=registry)
+    robot_sensors = Gauge('robot_sensors_total', 'Total number of sensors configured', 
                          ['robot_id'], registry=registry)
+    robot_health_checks = Counter('robot_health_checks_total', 'Total number of health checks performed', 
+                                 ['robot_id'], registry=registry)
+    robot_errors = Counter('robot_errors_total', 'Total number of errors encountered', 
+                          ['robot_id'], registry=registry)
+    robot_retries = Counter('robot_asset_validation_retries_total', 'Total number of asset validation retries', 
+                           ['robot_id'], registry=registry)
+    robot_initialized = Gauge('robot_initialized', 'Robot initialization status (1 = initialized, 0 = not initialized)', 
+                             ['robot_id'], registry=registry)
+    
+    robot_id = STATE.robot_id
+    children = {
+        "uptime": robot_uptime.labels(robot_id=robot_id),
+        "sensors": robot_sensors.labels(robot_id=robot_id),
+        "initialized": robot_initialized.labels(robot_id=robot_id),
+        "health_checks": robot_health_checks.labels(robot_id=robot_id),
+        "errors": robot_errors.labels(robot_id=robot_id),
+        "retries": robot_retries.labels(robot_id=robot_id)
+    }
+    # Sensors and initialization only change during startup
+    children["sensors"].set(len(STATE.sensors))
+    children["initialized"].set(1 if STATE.initialized else 0)
+    return registry, children
+
+def _report_counter(children: Dict[str, Any], name: str, total: int) -> None:
+    delta = total - _PROM_REPORTED[name]
+    if delta > 0:
+        children[name].inc(delta)
+        _PROM_REPORTED[name] = total
 
-@app.get("/prometheus")
-async def prometheus_metrics():
+# Plain def on purpose: generate_latest walks and encodes the whole registry under its
+# lock, the one handler here heavy enough to be worth the threadpool hop. The others only
+# merge precomputed dicts, so they stay async and skip it.
+@app.get("/prometheus", response_model=None)
+def prometheus_metrics():
     """Get metrics in Prometheus format"""
-    robot_id = STATE.get("robot_id", "unknown")
+    from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
     
-    # Update Gauge metrics
-    uptime = int(time.time() - STATE["startup_time"]) if STATE["startup_time"] else 0
-    robot_uptime.labels(robot_id=robot_id).set(uptime)
-    robot_sensors.labels(robot_id=robot_id).set(len(STATE["sensors"]) if STATE["sensors"] else 0)
-    robot_initialized.labels(robot_id=robot_id).set(1 if STATE["initialized"] else 0)
-    
-    # Update Counter metrics
-    robot_health_checks.labels(robot_id=robot_id)._value._value = STATE["health_checks"]
-    robot_errors.labels(robot_id=robot_id)._value._value = len(STATE["errors"])
-    robot_retries.labels(robot_id=robot_id)._value._value = STATE["asset_validation_retries"]
+    with _PROM_LOCK:
+        registry, children = _get_prom_registry()
+        children["uptime"].set(_uptime() or 0)
+        _report_counter(children, "health_checks", STATE.health_checks)
+        _report_counter(children, "errors", STATE.error_count)
+        _report_counter(children, "retries", STATE.asset_validation_retries)
     
     # Return metrics in Prometheus format
     return PlainTextResponse(
@@ -376,43 +628,27 @@ async def prometheus_metrics():
         media_type=CONTENT_TYPE_LATEST
     )
 
-@app.get("/init")
+@app.get("/init", response_model=None)
 async def initialization_info():
     """Print robot initialization message with full resolved configuration
     
     NOTE: In production, I would be hiding this endpoint behind some authentication layer
     since it exposes resolved secret configuration data (like wgs84_coordinates).
     """
-    if not STATE["initialized"]:
+    if not STATE.initialized:
         raise HTTPException(status_code=503, detail="Robot not initialized yet")
     
-    sensor_info = [format_sensor_info(sensor) for sensor in STATE["sensors"]]
-    initialization_message = f"Robot {STATE['robot_id']} initialized with sensors: {', '.join(sensor_info)}"
-    
-    return {
-        "robot_id": STATE["robot_id"],
-        "initialization_message": initialization_message,
-        "config_version": STATE["config_version"],
-        "initialized_at": STATE["startup_time"],
-        "sensors_configured": len(STATE["sensors"]),
-        "sensor_summary": sensor_info,
-        "full_resolved_config": {
-            "robot_id": STATE["robot_id"],
-            "version": STATE["config_version"], 
-            "sensors": STATE["sensors"]
-        },
-    }
+    return _INIT_RESPONSE
 
-@app.get("/")
+@app.get("/", response_model=None)
 async def root():
     """Root endpoint"""
-    return {
-        "message": "Robot Fleet Management System",
-        "robot_id": STATE.get("robot_id", "unknown"),
-        "status": "running" if STATE["initialized"] else "initializing",
-        "config_version": STATE["config_version"]
-    }
+    return _ROOT_RESPONSE
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    workers = int(os.getenv("WORKERS", "1"))
+    # uvloop/httptools ship with uvicorn[standard]; naming them fails fast instead of falling back
+    # to asyncio/h11. Multiple workers need the import string so each process can load the app.
+    uvicorn.run("app.main:app" if workers > 1 else app, host="0.0.0.0", port=8000,
+                loop="uvloop", http="httptools", workers=workers)
@@ -0,0 +1,37 @@
+"""Pre-start config validation
+
+Runs once per container before uvicorn so that asset validation (and its retry
+backoffs) is not repeated by every worker's startup:
+
+    python -m app.validate_config && uvicorn app.main:app
+
+Only a marker (config checksum plus the stat of every referenced asset) is written,
+never the config or its secrets; the app revalidates in-process if either changed.
+"""
+import os
+import sys
+import asyncio
+
+import orjson
+
+from app.main import log, load_config_bytes, validate_robot_config, write_validation_marker, VALIDATED_CONFIG_PATH
+
+async def validate(config_path: str) -> None:
+    raw_bytes, checksum = await load_config_bytes(config_path)
+    config = orjson.loads(raw_bytes)
+    await validate_robot_config(config)
+    write_validation_marker(config, checksum)
+
+def main() -> int:
+    config_path = os.getenv("ROBOT_CONFIG", "/app/config.json")
+    log.info(f"Validating configuration from: {config_path}")
+    try:
+        asyncio.run(validate(config_path))
+    except Exception as e:
+        log.error(f"Configuration validation failed: {e}")
+        return 1
+    log.info(f"Validation marker written to: {VALIDATED_CONFIG_PATH}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())